@@ -1,5 +1,5 @@
-from fastapi import APIRouter, UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, File, Query
+from fastapi.responses import JSONResponse, Response
 from ultralytics import YOLO
 from PIL import Image
 import torch
@@ -9,7 +9,10 @@ import numpy as np
 from ..utils.unet_model import UNet
 from torchvision import transforms
 import uuid
+import json
+import re
 import logging
+from functools import lru_cache
 from types import SimpleNamespace
 from typing import List, Dict
 
@@ -77,6 +80,16 @@ transform = transforms.Compose([
 SAVE_DIR = "static/uploads"
 os.makedirs(SAVE_DIR, exist_ok=True)
 
+# Video frames are stored as structured results; annotated/mask images are
+# rendered on first request and kept in an LRU cache.
+FRAMES_PAGE_SIZE = 50
+# Each entry is one full-resolution JPEG (a few hundred KB for 1080p frames)
+RENDER_CACHE_SIZE = 64
+# Each entry is a whole results file (boxes and per-frame summaries)
+RESULTS_CACHE_SIZE = 8
+RENDER_KINDS = ("yolo", "unet")
+_VIDEO_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
 
 @router.post("/detect")
 async def detect(image: UploadFile = File(...)):
@@ -217,11 +230,86 @@ def check_human_submerged(yolo_boxes, unet_mask, original_shape, threshold=0.1):
     return detections
 
 
+def _extract_boxes(yolo_boxes) -> List[Dict]:
+    """Convert YOLO boxes into plain dicts that can be stored as JSON."""
+    boxes = []
+    for box in yolo_boxes:
+        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy().astype(int).tolist()
+        boxes.append({
+            "xyxy": [x1, y1, x2, y2],
+            "cls": int(box.cls[0].cpu().numpy()),
+            "conf": float(box.conf[0].cpu().numpy())
+        })
+    return boxes
+
+
+def _results_path(video_id: str) -> str:
+    return os.path.join(SAVE_DIR, f"results_{video_id}.json")
+
+
+def _frames_page(frame_results: List[Dict], offset: int, limit: int) -> Dict:
+    """Slice frame results for a response, dropping internal render data."""
+    page = [
+        {k: v for k, v in fr.items() if k != "render"}
+        for fr in frame_results[offset:offset + limit]
+    ]
+    next_offset = offset + limit if offset + limit < len(frame_results) else None
+    return {"offset": offset, "next_offset": next_offset, "frames": page}
+
+
+@lru_cache(maxsize=RESULTS_CACHE_SIZE)
+def _load_video_results(video_id: str) -> Dict:
+    with open(_results_path(video_id)) as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_frame(video_id: str, frame_index: int, kind: str) -> bytes:
+    """
+    Render the YOLO-annotated frame or the U-Net display mask as JPEG bytes.
+
+    Results are cached, so each image is encoded at most once while it stays
+    in the cache.
+    """
+    render = _load_video_results(video_id)["frames"][frame_index]["render"]
+    frame_h, frame_w = render["frame_size"]
+    boxes = render["boxes"]
+
+    if kind == "yolo":
+        image = cv2.imread(os.path.join(SAVE_DIR, render["frame_file"]))
+        if image is None:
+            raise FileNotFoundError(render["frame_file"])
+        # Draw only person boxes (COCO class 0)
+        for box in boxes:
+            if box["cls"] == 0 and box["conf"] > 0.1:
+                x1, y1, x2, y2 = box["xyxy"]
+                cv2.rectangle(image, (x1, y1), (x2, y2), (255, 0, 0), 2)
+                label = f"person {box['conf']:.2f}"
+                cv2.putText(image, label, (x1, max(15, y1 - 5)), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 1)
+    else:
+        # Black background with white outlines for detected humans
+        image = np.zeros((frame_h, frame_w), dtype=np.uint8)
+        for box in boxes:
+            x1, y1, x2, y2 = box["xyxy"]
+            cv2.rectangle(image, (x1, y1), (x2, y2), color=255, thickness=2)
+
+    ok, encoded = cv2.imencode(".jpg", image)
+    if not ok:
+        raise RuntimeError("Failed to encode rendered image")
+    return encoded.tobytes()
+
+
 @router.post("/detect-video")
-async def detect_video(video: UploadFile = File(...)):
+async def detect_video(
+    video: UploadFile = File(...),
+    limit: int = Query(FRAMES_PAGE_SIZE, ge=1, le=FRAMES_PAGE_SIZE)
+):
     """
     Process video: extract frames at 10-second intervals,
     run YOLO and U-Net on each frame, and determine if humans are submerged.
+
+    Only the first `limit` frames are returned; the rest can be fetched from
+    /videos/{video_id}/frames. Annotated and mask images are rendered lazily.
     """
     try:
         # Save uploaded video
@@ -258,41 +346,22 @@ async def detect_video(video: UploadFile = File(...)):
             if frame_number % frame_interval == 0 or frame_number == 0:
                 timestamp = frame_number / fps if fps > 0 else frame_number * 0.033
                 
-                # Save frame temporarily
+                # Save original frame (source for lazily rendered outputs)
                 frame_filename = f"frame_{video_id}_{int(timestamp)}.jpg"
                 frame_path = os.path.join(SAVE_DIR, frame_filename)
                 cv2.imwrite(frame_path, frame)
+                frame_index = len(frame_results)
                 
                 # Convert to PIL Image for processing
                 pil_img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
                 original_shape = frame.shape
                 
-                # Run YOLOv8
-                yolo_result = yolo_model(frame_path)[0]
-                
-                # Save YOLO annotated frame
-                yolo_frame_filename = f"yolo_{frame_filename}"
-                yolo_frame_path = os.path.join(SAVE_DIR, yolo_frame_filename)
-                # Create person-only annotated image (draw only person boxes)
-                try:
-                    annotated_img = frame.copy()
-                    for box in yolo_result.boxes:
-                        cls = int(box.cls[0].cpu().numpy())
-                        conf = float(box.conf[0].cpu().numpy())
-                        if cls == 0 and conf > 0.1:
-                            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy().astype(int).tolist()
-                            cv2.rectangle(annotated_img, (x1, y1), (x2, y2), (255, 0, 0), 2)
-                            label = f"person {conf:.2f}"
-                            cv2.putText(annotated_img, label, (x1, max(15, y1 - 5)), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 1)
-                    cv2.imwrite(yolo_frame_path, annotated_img)
-                except Exception:
-                    # fallback to YOLO's plot method if anything fails
-                    try:
-                        annotated_img = yolo_result.plot()
-                        cv2.imwrite(yolo_frame_path, annotated_img)
-                    except Exception:
-                        pass
-                
+                # Run YOLOv8 on the in-memory frame
+                yolo_result = yolo_model(frame)[0]
+
+                # Keep raw boxes; annotated image is rendered on demand
+                boxes = _extract_boxes(yolo_result.boxes)
+
                 # Run U-Net
                 input_tensor = transform(pil_img).unsqueeze(0).to(device)
                 with torch.no_grad():
@@ -304,22 +373,6 @@ async def detect_video(video: UploadFile = File(...)):
                 mask_resized = cv2.resize(pred_mask_np, (original_shape[1], original_shape[0]))
                 binary_mask_for_check = (mask_resized > 0.5).astype(np.uint8)  # 0/1 format for checking
 
-                # Create display mask (black background) and draw white outlines for detected humans
-                display_mask = np.zeros((original_shape[0], original_shape[1]), dtype=np.uint8)
-                try:
-                    for box in yolo_result.boxes:
-                        xyxy = box.xyxy[0].cpu().numpy().astype(int)
-                        x1, y1, x2, y2 = xyxy.tolist()
-                        cv2.rectangle(display_mask, (x1, y1), (x2, y2), color=255, thickness=2)
-                except Exception:
-                    edges = cv2.Canny((binary_mask_for_check * 255).astype(np.uint8), 50, 150)
-                    display_mask = cv2.bitwise_or(display_mask, edges)
-
-                # Save U-Net display mask
-                unet_frame_filename = f"unet_{frame_filename}"
-                unet_frame_path = os.path.join(SAVE_DIR, unet_frame_filename)
-                cv2.imwrite(unet_frame_path, display_mask)
-                
                 # Check if humans are submerged
                 detections = check_human_submerged(
                     yolo_result.boxes,
@@ -348,14 +401,19 @@ async def detect_video(video: UploadFile = File(...)):
                     "timestamp": float(round(timestamp, 2)),
                     "frame_number": int(frame_number),
                     "original_frame": f"/static/uploads/{frame_filename}",
-                    "yolo_output": f"/static/uploads/{yolo_frame_filename}",
-                    "unet_output": f"/static/uploads/{unet_frame_filename}",
+                    "yolo_output": f"/api/videos/{video_id}/frames/{frame_index}/yolo",
+                    "unet_output": f"/api/videos/{video_id}/frames/{frame_index}/unet",
                     "detections": detections,
                     "human_count": int(human_count),
                     "submerged_count": int(submerged_count),
                     "status": str(status),
                     "message": str(message),
-                    "alert_level": str(alert_level)
+                    "alert_level": str(alert_level),
+                    "render": {
+                        "frame_file": frame_filename,
+                        "frame_size": [int(original_shape[0]), int(original_shape[1])],
+                        "boxes": boxes
+                    }
                 })
             
             frame_number += 1
@@ -376,17 +434,60 @@ async def detect_video(video: UploadFile = File(...)):
             else f"{total_humans} human(s) detected across {len(frame_results)} frames"
         )
         
-        return JSONResponse(content={
+        summary = {
             "video_id": str(video_id),
             "video_duration": float(round(duration, 2)),
             "total_frames_processed": int(len(frame_results)),
             "overall_status": str(overall_status),
             "overall_message": str(overall_message),
             "total_humans_detected": int(total_humans),
-            "total_submerged": int(total_submerged),
-            "frames": frame_results
-        })
+            "total_submerged": int(total_submerged)
+        }
+        with open(_results_path(video_id), "w") as f:
+            json.dump({**summary, "frames": frame_results}, f)
+
+        return JSONResponse(content={**summary, **_frames_page(frame_results, 0, limit)})
     
     except Exception as e:
         logger.error(f"Error processing video: {str(e)}", exc_info=True)
         return JSONResponse(status_code=500, content={"error": str(e)})
+
+
+@router.get("/videos/{video_id}/frames")
+def list_video_frames(
+    video_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(FRAMES_PAGE_SIZE, ge=1, le=FRAMES_PAGE_SIZE)
+):
+    """Return a page of frame results for a previously processed video."""
+    if not _VIDEO_ID_RE.match(video_id) or not os.path.exists(_results_path(video_id)):
+        return JSONResponse(status_code=404, content={"error": "Video not found"})
+
+    try:
+        results = _load_video_results(video_id)
+        return JSONResponse(content={
+            "video_id": video_id,
+            "total_frames_processed": len(results["frames"]),
+            **_frames_page(results["frames"], offset, limit)
+        })
+    except Exception as e:
+        logger.error(f"Error loading video results: {str(e)}", exc_info=True)
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+
+@router.get("/videos/{video_id}/frames/{frame_index}/{kind}")
+def render_video_frame(video_id: str, frame_index: int, kind: str):
+    """Render the YOLO ("yolo") or U-Net ("unet") output for a processed frame."""
+    if kind not in RENDER_KINDS:
+        return JSONResponse(status_code=404, content={"error": f"Unknown output '{kind}'"})
+    if not _VIDEO_ID_RE.match(video_id) or not os.path.exists(_results_path(video_id)):
+        return JSONResponse(status_code=404, content={"error": "Video not found"})
+
+    try:
+        if not 0 <= frame_index < len(_load_video_results(video_id)["frames"]):
+            return JSONResponse(status_code=404, content={"error": "Frame not found"})
+        image_bytes = _render_frame(video_id, frame_index, kind)
+    except Exception as e:
+        logger.error(f"Error rendering frame: {str(e)}", exc_info=True)
+        return JSONResponse(status_code=500, content={"error": str(e)})
+    return Response(content=image_bytes, media_type="image/jpeg")
@@ -11,6 +11,7 @@ const AIDetection = () => {
     const saved = localStorage.getItem('videoResults');
     return saved ? JSON.parse(saved) : null;
   });
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [error, setError] = useState(null);
   const [selectedFile, setSelectedFile] = useState(null);
   const [videoPreviewUrl, setVideoPreviewUrl] = useState(null);
@@ -54,6 +55,39 @@ const AIDetection = () => {
     localStorage.removeItem('videoResults');
   };
 
+  // Fetch the next page of frame results (paginated by the backend)
+  const handleLoadMoreFrames = async () => {
+    if (!videoResults || videoResults.next_offset == null) {
+      return;
+    }
+
+    setIsLoadingMore(true);
+    setError(null);
+
+    try {
+      const response = await fetch(
+        `${API_BASE_URL}/api/videos/${videoResults.video_id}/frames?offset=${videoResults.next_offset}`
+      );
+
+      if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.error || 'Failed to load more frames');
+      }
+
+      const page = await response.json();
+      setVideoResults((prev) => ({
+        ...prev,
+        frames: prev.frames.concat(page.frames),
+        next_offset: page.next_offset,
+      }));
+    } catch (err) {
+      setError(err.message || 'An error occurred while loading frames');
+      console.error('Load more error:', err);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const handleUpload = async () => {
     if (!selectedFile) {
       setError('Please select a file first');
@@ -362,6 +396,7 @@ const AIDetection = () => {
                       <div className="aspect-video bg-gray-200 relative overflow-hidden">
                         <img
                           src={`${API_BASE_URL}${frame.yolo_output}`}
+                          loading="lazy"
                           alt={`YOLO detection at ${formatTime(frame.timestamp)}`}
                           className="w-full h-full object-cover"
                           onError={(e) => {
@@ -385,6 +420,7 @@ const AIDetection = () => {
                       <div className="aspect-video bg-gray-200 relative overflow-hidden">
                         <img
                           src={`${API_BASE_URL}${frame.unet_output}`}
+                          loading="lazy"
                           alt={`U-Net segmentation at ${formatTime(frame.timestamp)}`}
                           className="w-full h-full object-cover"
                           onError={(e) => {
@@ -427,6 +463,18 @@ const AIDetection = () => {
                 </div>
               ))}
             </div>
+
+            {videoResults.next_offset != null && (
+              <div className="mt-8 text-center">
+                <button
+                  onClick={handleLoadMoreFrames}
+                  disabled={isLoadingMore}
+                  className="inline-flex items-center px-6 py-3 bg-sky-600 text-white font-semibold rounded-lg hover:bg-sky-700 transition-colors disabled:bg-gray-400 disabled:cursor-not-allowed"
+                >
+                  {isLoadingMore ? 'Loading...' : 'Load More Frames'}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </div>